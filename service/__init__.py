@@ -25,6 +25,7 @@ import sys
 from flask import Flask
 from service import config
 from service.common import log_handlers
+from service.common.json_provider import OrjsonProvider
 
 # NOTE: Do not change the order of this code
 # The Flask app must be created
@@ -36,6 +37,9 @@ app = Flask(__name__)  # pylint: disable=invalid-name
 # Load Configurations
 app.config.from_object(config)
 
+# Use orjson for jsonify() and request.get_json()
+app.json = OrjsonProvider(app)
+
 # Dependencies require we import the routes AFTER the Flask app is created
 # pylint: disable=wrong-import-position, wrong-import-order, cyclic-import
 from service import routes, models        # noqa: F401, E402
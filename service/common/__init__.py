@@ -21,5 +21,6 @@ This package contains utility code that is not part
 of any particular application
 """
 from .log_handlers import init_logging
+from .json_provider import OrjsonProvider
 
-__all__ = ('init_logging',)
+__all__ = ('init_logging', 'OrjsonProvider')
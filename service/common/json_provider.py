@@ -0,0 +1,49 @@
+######################################################################
+# Copyright 2016, 2023 John J. Rofrano. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+######################################################################
+
+"""
+JSON Provider
+
+This module contains a Flask JSON provider that uses orjson so that
+jsonify() and request.get_json() do not go through the stdlib json module
+"""
+import orjson
+from flask.json.provider import JSONProvider
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps_bytes(self, obj) -> bytes:
+        """Serialize data as UTF-8 encoded JSON bytes"""
+        return orjson.dumps(obj, default=str)
+
+    def dumps(self, obj, **_kwargs) -> str:
+        """Serialize data as JSON to a string"""
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **_kwargs):  # pylint: disable=invalid-name
+        """Deserialize data as JSON from a string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as JSON and return a Response
+
+        The orjson bytes are used as the body directly so they are not
+        decoded to a string and encoded again by Werkzeug
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype="application/json")
@@ -30,14 +30,17 @@ available (boolean) - True for products that are available for adoption
 """
 import logging
 from enum import Enum
-from decimal import Decimal
+from typing import Iterable
+from decimal import Decimal, InvalidOperation
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
 logger = logging.getLogger("flask.app")
 
 # Create the SQLAlchemy object to be initialized later in init_db()
-db = SQLAlchemy()
+# Instances keep their loaded state after commit so serializing a Product
+# that was just created or updated does not issue a refresh SELECT
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 
 def init_db(app):
@@ -45,6 +48,23 @@ def init_db(app):
     Product.init_db(app)
 
 
+# Builds the same shape as Product.serialize() inside the database
+ALL_AS_JSON_SQL = """
+SELECT COALESCE(
+    json_agg(json_build_object(
+        'id', id,
+        'name', name,
+        'description', description,
+        'price', price::text,
+        'available', available,
+        'category', category
+    )),
+    '[]'::json
+)::text
+FROM product
+"""
+
+
 class DataValidationError(Exception):
     """Used for an data validation errors when deserializing"""
 
@@ -140,11 +160,16 @@ class Product(db.Model):
                     "Invalid type for boolean [available]: "
                     + str(type(data["available"]))
                 )
-            self.category = getattr(Category, data["category"])  # create enum from string
-        except AttributeError as error:
-            raise DataValidationError("Invalid attribute: " + error.args[0]) from error
+            category = Category.__members__.get(data["category"])  # create enum from string
+            if category is None:
+                raise DataValidationError("Invalid attribute: " + str(data["category"]))
+            self.category = category
         except KeyError as error:
             raise DataValidationError("Invalid product: missing " + error.args[0]) from error
+        except (InvalidOperation, ValueError) as error:
+            raise DataValidationError(
+                "Invalid value for decimal [price]: " + str(data["price"])
+            ) from error
         except TypeError as error:
             raise DataValidationError(
                 "Invalid product: body of request contained bad or no data " + str(error)
@@ -175,6 +200,20 @@ class Product(db.Model):
         logger.info("Processing all Products")
         return cls.query.all()
 
+    @classmethod
+    def all_as_json(cls) -> str:
+        """Returns all of the Products serialized as a JSON array by the database
+
+        The JSON is built by PostgreSQL so the rows never have to be
+        loaded as Product instances just to be turned back into dicts
+
+        :return: a JSON array of serialized Products
+        :rtype: str
+
+        """
+        logger.info("Processing all Products as JSON")
+        return db.session.execute(db.text(ALL_AS_JSON_SQL)).scalar()
+
     @classmethod
     def find(cls, product_id: int):
         """Finds a Product by it's ID
@@ -187,63 +226,107 @@ class Product(db.Model):
 
         """
         logger.info("Processing lookup for id %s ...", product_id)
-        return cls.query.get(product_id)
+        # Session.get() checks the identity map before issuing a SELECT
+        return db.session.get(cls, product_id)
+
+    @classmethod
+    def find_many(cls, product_ids: list) -> list:
+        """Finds all of the Products with the given IDs in a single query
+
+        :param product_ids: the ids of the Products to find
+        :type product_ids: list
+
+        :return: the Products that were found
+        :rtype: list
+
+        """
+        logger.info("Processing lookup for ids %s ...", product_ids)
+        return cls.query.filter(cls.id.in_(product_ids)).all()
+
+    @classmethod
+    def _run_finder(cls, statement, params: dict, yield_per: int = None) -> Iterable:
+        """Runs a finder statement, streaming the rows when yield_per is given"""
+        if yield_per:
+            return db.session.scalars(statement.execution_options(yield_per=yield_per), params)
+        return db.session.scalars(statement, params).all()
 
     @classmethod
-    def find_by_name(cls, name: str) -> list:
+    def find_by_name(cls, name: str, yield_per: int = None) -> Iterable:
         """Returns all Products with the given name
 
         :param name: the name of the Products you want to match
         :type name: str
+        :param yield_per: stream the results in blocks of this many rows
+        :type yield_per: int
 
-        :return: a collection of Products with that name
-        :rtype: list
+        :return: a list of Products with that name, or a single-use
+            iterable of them when yield_per is given
+        :rtype: Iterable
 
         """
         logger.info("Processing name query for %s ...", name)
-        return cls.query.filter(cls.name == name)
+        return cls._run_finder(_FIND_BY_NAME, {"name": name}, yield_per)
 
     @classmethod
-    def find_by_price(cls, price: Decimal) -> list:
+    def find_by_price(cls, price: Decimal, yield_per: int = None) -> Iterable:
         """Returns all Products with the given price
 
         :param price: the price to search for
         :type name: float
+        :param yield_per: stream the results in blocks of this many rows
+        :type yield_per: int
 
-        :return: a collection of Products with that price
-        :rtype: list
+        :return: a list of Products with that price, or a single-use
+            iterable of them when yield_per is given
+        :rtype: Iterable
 
         """
         logger.info("Processing price query for %s ...", price)
         price_value = price
         if isinstance(price, str):
             price_value = Decimal(price.strip(' "'))
-        return cls.query.filter(cls.price == price_value)
+        return cls._run_finder(_FIND_BY_PRICE, {"price": price_value}, yield_per)
 
     @classmethod
-    def find_by_availability(cls, available: bool = True) -> list:
+    def find_by_availability(cls, available: bool = True, yield_per: int = None) -> Iterable:
         """Returns all Products by their availability
 
         :param available: True for products that are available
         :type available: str
+        :param yield_per: stream the results in blocks of this many rows
+        :type yield_per: int
 
-        :return: a collection of Products that are available
-        :rtype: list
+        :return: a list of Products that are available, or a single-use
+            iterable of them when yield_per is given
+        :rtype: Iterable
 
         """
         logger.info("Processing available query for %s ...", available)
-        return cls.query.filter(cls.available == available)
+        return cls._run_finder(_FIND_BY_AVAILABILITY, {"available": available}, yield_per)
 
     @classmethod
-    def find_by_category(cls, category: Category = Category.UNKNOWN) -> list:
+    def find_by_category(cls, category: Category = Category.UNKNOWN, yield_per: int = None) -> Iterable:
         """Returns all Products by their Category
 
         :param category: values are ['MALE', 'FEMALE', 'UNKNOWN']
         :type available: enum
+        :param yield_per: stream the results in blocks of this many rows
+        :type yield_per: int
 
-        :return: a collection of Products that are available
-        :rtype: list
+        :return: a list of Products in that category, or a single-use
+            iterable of them when yield_per is given
+        :rtype: Iterable
 
         """
         logger.info("Processing category query for %s ...", category.name)
-        return cls.query.filter(cls.category == category)
+        return cls._run_finder(_FIND_BY_CATEGORY, {"category": category}, yield_per)
+
+
+######################################################################
+# Finder statements are built once here so each call only binds new
+# parameter values
+######################################################################
+_FIND_BY_NAME = db.select(Product).where(Product.name == db.bindparam("name"))
+_FIND_BY_PRICE = db.select(Product).where(Product.price == db.bindparam("price"))
+_FIND_BY_AVAILABILITY = db.select(Product).where(Product.available == db.bindparam("available"))
+_FIND_BY_CATEGORY = db.select(Product).where(Product.category == db.bindparam("category"))
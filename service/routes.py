@@ -14,16 +14,21 @@
 # limitations under the License.
 ######################################################################
 
-# spell: ignore Rofrano jsonify restx dbname
+# spell: ignore Rofrano jsonify restx dbname orjson
 """
 Product Store Service with UI
 """
-from flask import jsonify, request, abort
+from itertools import chain
+import orjson
+from flask import request, abort, stream_with_context
 from flask import url_for  # noqa: F401 pylint: disable=unused-import
 from service.models import Product, Category
 from service.common import status  # HTTP Status Codes
 from . import app
 
+# Number of rows fetched from the database per block when streaming lists
+STREAM_BLOCK_SIZE = 500
+
 
 ######################################################################
 # H E A L T H   C H E C K
@@ -31,7 +36,7 @@ from . import app
 @app.route("/health")
 def healthcheck():
     """Let them know our heart is still beating"""
-    return jsonify(status=200, message="OK"), status.HTTP_200_OK
+    return _json({"status": 200, "message": "OK"}, status.HTTP_200_OK)
 
 
 ######################################################################
@@ -46,23 +51,56 @@ def index():
 ######################################################################
 #  U T I L I T Y   F U N C T I O N S
 ######################################################################
+def _json(payload, code=status.HTTP_200_OK, headers=None):
+    """Builds a JSON response through the app's orjson JSON provider"""
+    response = app.json.response(payload)
+    response.status_code = code
+    if headers:
+        response.headers.update(headers)
+    return response
+
+
+def _stream_json(products, block_size=STREAM_BLOCK_SIZE):
+    """Yields a JSON array of serialized Products one block of rows at a time"""
+    serialize = Product.serialize  # resolve the method once, not per row
+    dumps = app.json.dumps_bytes
+    prefix = b"["
+    count = 0
+    block = []
+    for product in products:
+        block.append(dumps(serialize(product)))
+        if len(block) == block_size:
+            yield prefix + b",".join(block)
+            prefix = b","
+            count += len(block)
+            block = []
+    count += len(block)
+    app.logger.info("Number of products: [%s]", count)
+    if block:
+        yield prefix + b",".join(block) + b"]"
+    else:
+        yield b"]" if count else b"[]"
+
+
 def check_content_type(content_type):
     """Checks that the media type is correct"""
-    if "Content-Type" not in request.headers:
-        app.logger.error("No Content-Type specified.")
+    # mimetype is parsed once by Werkzeug and excludes parameters like charset
+    if request.mimetype != content_type:
+        app.logger.error("Invalid Content-Type: %s", request.content_type)
         abort(
             status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             f"Content-Type must be {content_type}",
         )
 
-    if request.headers["Content-Type"] == content_type:
-        return
 
-    app.logger.error("Invalid Content-Type: %s", request.headers["Content-Type"])
-    abort(
-        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-        f"Content-Type must be {content_type}",
-    )
+def parse_json_body():
+    """Decodes the request body with orjson, aborting with 400 if it is not JSON"""
+    try:
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        app.logger.error("Invalid JSON in request body")
+        abort(status.HTTP_400_BAD_REQUEST, "Request body must be valid JSON")
+    return data
 
 
 ######################################################################
@@ -77,7 +115,7 @@ def create_products():
     app.logger.info("Request to Create a Product...")
     check_content_type("application/json")
 
-    data = request.get_json()
+    data = parse_json_body()
     app.logger.info("Processing: %s", data)
     product = Product()
     product.deserialize(data)
@@ -91,7 +129,7 @@ def create_products():
     #
     # location_url = url_for("get_products", product_id=product.id, _external=True)
     location_url = "/"  # delete once READ is implemented
-    return jsonify(message), status.HTTP_201_CREATED, {"Location": location_url}
+    return _json(message, status.HTTP_201_CREATED, {"Location": location_url})
 
 
 ######################################################################
@@ -106,37 +144,43 @@ def get_all_products():
     name = request.args.get("name")
     category = request.args.get("category")
     availability = request.args.get("available")
-    products = []
 
     if name:
         app.logger.info("Find by name: %s", name)
-        products = Product.find_by_name(name)
+        products = Product.find_by_name(name, yield_per=STREAM_BLOCK_SIZE)
     elif category:
         app.logger.info("Find by category %s", category)
-        category_value = getattr(Category, category.upper())
-        products = Product.find_by_category(category_value)
+        try:
+            category_value = Category[category.upper()]
+        except KeyError:
+            abort(status.HTTP_400_BAD_REQUEST, f"Invalid category: {category}")
+        products = Product.find_by_category(category_value, yield_per=STREAM_BLOCK_SIZE)
     elif availability:
         app.logger.info("Find by availability: %s", availability)
-        available_value = availability.lower() in ["True", "true", "yes", "1"]
-        products = Product.find_by_availability(available_value)
+        available_value = availability.lower() in ["true", "yes", "1"]
+        products = Product.find_by_availability(available_value, yield_per=STREAM_BLOCK_SIZE)
     else:
-        products = Product.all()
         app.logger.info("Find all")
+        return app.response_class(
+            Product.all_as_json(), status=status.HTTP_200_OK, mimetype="application/json"
+        )
 
-    serialized_products = []
-    for product in products:
-        serialized_products.append(product.serialize())
-
-    app.logger.info("Number of products: [%s]", len(serialized_products))
-
-    return jsonify(serialized_products), status.HTTP_200_OK
+    # The finders fetch rows in blocks so the full result set is never held in memory.
+    # Build the first block here so errors reading it still reach the error handlers.
+    chunks = _stream_json(products)
+    first_chunk = next(chunks)
+    return app.response_class(
+        stream_with_context(chain([first_chunk], chunks)),
+        status=status.HTTP_200_OK,
+        mimetype="application/json",
+    )
 
 
 ######################################################################
 # R E A D   A   P R O D U C T
 ######################################################################
 
-@app.route('/products/<product_id>', methods=['GET'])
+@app.route('/products/<int:product_id>', methods=['GET'])
 def get_products(product_id):
     """
     Get a Product
@@ -149,17 +193,16 @@ def get_products(product_id):
     app.logger.info(product)
 
     if product is None:
-        return jsonify("Product not found"), status.HTTP_404_NOT_FOUND, {"Location": location_url}
+        return _json("Product not found", status.HTTP_404_NOT_FOUND, {"Location": location_url})
 
-    product_id = product.id
-    return jsonify(Product.serialize(product)), status.HTTP_200_OK, {"Location": location_url}
+    return _json(Product.serialize(product), status.HTTP_200_OK, {"Location": location_url})
 
 
 ######################################################################
 # U P D A T E   A   P R O D U C T
 ######################################################################
 
-@app.route('/products/<product_id>', methods=['PUT'])
+@app.route('/products/<int:product_id>', methods=['PUT'])
 def update_products(product_id):
     """
     Update a Product
@@ -173,20 +216,20 @@ def update_products(product_id):
     if product is None:
         abort(status.HTTP_404_NOT_FOUND)
 
-    product.deserialize(data=request.get_json())
+    product.deserialize(data=parse_json_body())
 
     product.update()
 
     location_url = url_for("update_products", product_id=product_id, _external=True)
 
-    return jsonify(Product.serialize(product)), status.HTTP_200_OK, {"Location": location_url}
+    return _json(Product.serialize(product), status.HTTP_200_OK, {"Location": location_url})
 
 
 ######################################################################
 # D E L E T E   A   P R O D U C T
 ######################################################################
 
-@app.route('/products/<product_id>', methods=['DELETE'])
+@app.route('/products/<int:product_id>', methods=['DELETE'])
 def delete_product(product_id):
     """
     Delete a product
@@ -19,7 +19,7 @@ Test Factory to make fake objects for testing
 """
 import factory
 from factory.fuzzy import FuzzyChoice, FuzzyDecimal
-from service.models import Product, Category
+from service.models import Product, Category, db
 
 
 class ProductFactory(factory.Factory):
@@ -55,3 +55,18 @@ class ProductFactory(factory.Factory):
         Category.AUTOMOTIVE,
         Category.TOOLS
         ])
+
+
+def create_products(count: int = 1) -> list:
+    """Saves count fake products to the database in one transaction
+
+    The session is removed afterwards so the returned products are detached
+    and any later read has to come from the database, not the identity map
+    """
+    products = ProductFactory.build_batch(count)
+    for product in products:
+        product.id = None  # let the database assign the ids
+    db.session.add_all(products)
+    db.session.commit()
+    db.session.remove()
+    return products